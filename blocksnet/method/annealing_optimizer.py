@@ -3,7 +3,9 @@ Module providing class for simulated annealing optimization of blocks services c
 """
 import random
 import math
+from functools import cached_property
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from typing import Callable
@@ -153,7 +155,7 @@ class Indicator:
         self.fsi = fsi
         self.gsi = gsi
 
-    @property
+    @cached_property
     def site_area(self):
         """
         Gets the site area of the block.
@@ -165,7 +167,7 @@ class Indicator:
         """
         return self.block.site_area
 
-    @property
+    @cached_property
     def footprint_area(self):
         """
         Calculates the footprint area of the block based on the GSI.
@@ -177,7 +179,7 @@ class Indicator:
         """
         return self.site_area * self.gsi
 
-    @property
+    @cached_property
     def build_floor_area(self):
         """
         Calculates the buildable floor area of the block based on the FSI.
@@ -189,7 +191,7 @@ class Indicator:
         """
         return self.site_area * self.fsi
 
-    @property
+    @cached_property
     def integrated_area(self):
         """
         Determines the integrated area of the block based on land use.
@@ -204,7 +206,7 @@ class Indicator:
         else:
             return self.build_floor_area
 
-    @property
+    @cached_property
     def non_integrated_area(self):
         """
         Calculates the non-integrated area of the block.
@@ -216,7 +218,7 @@ class Indicator:
         """
         return VACANT_AREA_COEF * self.site_area - self.footprint_area
 
-    @property
+    @cached_property
     def living_area(self):
         """
         Determines the living area of the block based on land use.
@@ -231,7 +233,7 @@ class Indicator:
         else:
             return 0
 
-    @property
+    @cached_property
     def population(self):
         """
         Estimates the population of the block based on living area and demand.
@@ -297,24 +299,21 @@ class AnnealingOptimizer(BaseMethod):
             True if all constraints are satisfied, False otherwise.
         """
         df = self.to_bricks_df(X)
-        df["integrated_area"] = df.apply(lambda s: s["area"] * s["count"] if s["is_integrated"] else 0, axis=1)
-        df["non_integrated_area"] = df.apply(lambda s: s["area"] * s["count"] if not s["is_integrated"] else 0, axis=1)
 
-        if any(df["count"] < 0):
+        if (df["count"] < 0).any():
             return False
 
-        df = df.groupby("block_id").agg({"integrated_area": "sum", "non_integrated_area": "sum"})
-
-        for block_id in df.index:
+        areas = df["area"] * df["count"]
+        df["integrated_area"] = np.where(df["is_integrated"], areas, 0)
+        df["non_integrated_area"] = np.where(df["is_integrated"], 0, areas)
 
-            indicator = indicators[block_id]
-
-            integrated_area = indicator.integrated_area
-            if df.loc[block_id, "integrated_area"] > integrated_area:
-                return False
+        df = df.groupby("block_id").agg({"integrated_area": "sum", "non_integrated_area": "sum"})
 
-            if df.loc[block_id, "non_integrated_area"] > integrated_area:
-                return False
+        limits = pd.Series({block_id: indicators[block_id].integrated_area for block_id in df.index})
+        if (df["integrated_area"] > limits).any():
+            return False
+        if (df["non_integrated_area"] > limits).any():
+            return False
         return True
 
     @staticmethod
@@ -332,11 +331,13 @@ class AnnealingOptimizer(BaseMethod):
         tuple[list[Variable], ServiceType]
             A tuple containing the perturbed list of variables and the service type of the perturbed variable.
         """
-        new_X = [Variable(x.block, x.service_type, x.brick, x.value) for x in X]
-        x = random.choice(new_X)
+        # copy-on-write: only the perturbed variable is replaced, the rest are shared
+        new_X = list(X)
+        i = random.randrange(len(new_X))
+        old_x = new_X[i]
         delta = random.choice([-1, 1])
-        x.value += delta
-        return new_X, x.service_type
+        new_X[i] = Variable(old_x.block, old_x.service_type, old_x.brick, old_x.value + delta)
+        return new_X, new_X[i].service_type
 
     def _generate_initial_X(self, blocks_lu: dict[int, LandUse], service_types: dict[str, float]) -> list[Variable]:
         """
@@ -355,10 +356,13 @@ class AnnealingOptimizer(BaseMethod):
             A list of variables representing the initial solution.
         """
         X = []
+        user_service_types = {self.city_model[st_name] for st_name in service_types.keys()}
+        lu_service_types_cache: dict[LandUse, set[ServiceType]] = {}
         for block_id, land_use in blocks_lu.items():
             block = self.city_model[block_id]
-            user_service_types = {self.city_model[st_name] for st_name in service_types.keys()}
-            lu_service_types = set(self.city_model.get_land_use_service_types(land_use))
+            if land_use not in lu_service_types_cache:
+                lu_service_types_cache[land_use] = set(self.city_model.get_land_use_service_types(land_use))
+            lu_service_types = lu_service_types_cache[land_use]
             for service_type in user_service_types & lu_service_types:
                 for brick in service_type.bricks:
                     x = Variable(block=block, service_type=service_type, brick=brick)
@@ -402,8 +406,8 @@ class AnnealingOptimizer(BaseMethod):
             A GeoDataFrame containing optimization result data.
         """
         df = self.to_df(X, indicators)
-        df["geometry"] = df.apply(lambda s: self.city_model[s.name].geometry, axis=1)
-        df["land_use"] = df.apply(lambda s: indicators[s.name].land_use.value, axis=1)
+        df["geometry"] = [self.city_model[block_id].geometry for block_id in df.index]
+        df["land_use"] = [indicators[block_id].land_use.value for block_id in df.index]
         return gpd.GeoDataFrame(df, crs=self.city_model.crs)
 
     def to_bricks_df(self, X: list[Variable]) -> pd.DataFrame:
@@ -420,18 +424,16 @@ class AnnealingOptimizer(BaseMethod):
         pd.DataFrame
             A DataFrame containing data about the bricks in the solution.
         """
-        xs = [
+        df = pd.DataFrame(
             {
-                "block_id": x.block.id,
-                "service_type": x.service_type.name,
-                "is_integrated": x.brick.is_integrated,
-                "area": x.brick.area,
-                "capacity": x.brick.capacity,
-                "count": x.value,
+                "block_id": [x.block.id for x in X],
+                "service_type": [x.service_type.name for x in X],
+                "is_integrated": [x.brick.is_integrated for x in X],
+                "area": [x.brick.area for x in X],
+                "capacity": [x.brick.capacity for x in X],
+                "count": [x.value for x in X],
             }
-            for x in X
-        ]
-        df = pd.DataFrame(list(xs))
+        )
         return df[df["count"] != 0]
 
     def _get_clear_df(self, blocks: list[int]) -> pd.DataFrame:
@@ -450,13 +452,9 @@ class AnnealingOptimizer(BaseMethod):
         """
         gdf = self.city_model.get_blocks_gdf()
         gdf = gdf[gdf.index.isin(blocks)]
-        df = gdf[["population"]].copy()
-        df["population"] = -df["population"]
-        df.sum()
-        for column in [column for column in gdf.columns if "capacity_" in column]:
-            st_name = column.removeprefix("capacity_")
-            df[st_name] = -gdf[column]
-        return df
+        capacity_columns = [column for column in gdf.columns if "capacity_" in column]
+        df = -gdf[["population", *capacity_columns]]
+        return df.rename(columns={column: column.removeprefix("capacity_") for column in capacity_columns})
 
     def to_df(self, X: list[Variable], indicators: dict[int, Indicator]) -> pd.DataFrame:
         """
@@ -474,18 +472,18 @@ class AnnealingOptimizer(BaseMethod):
         pd.DataFrame
             A DataFrame containing data about the blocks and their service capacities.
         """
-        service_types = {x.service_type for x in X}
         df = pd.DataFrame(
-            [
-                {
-                    "block_id": x.block.id,
-                    "population": indicators[x.block.id].population,
-                    x.service_type.name: x.capacity,
-                }
-                for x in X
-            ]
+            {
+                "block_id": [x.block.id for x in X],
+                "population": [indicators[x.block.id].population for x in X],
+                "service_type": [x.service_type.name for x in X],
+                "capacity": [x.capacity for x in X],
+            }
         )
-        return df.groupby("block_id").agg({"population": "min", **{st.name: "sum" for st in service_types}})
+        res = df.pivot_table(index="block_id", columns="service_type", values="capacity", aggfunc="sum", fill_value=0)
+        res.columns.name = None
+        res.insert(0, "population", df.groupby("block_id")["population"].min())
+        return res
 
     def calculate(
         self,
@@ -95,14 +95,16 @@ class Centrality(BaseMethod):
         geopandas.GeoDataFrame
             GeoDataFrame containing blocks with calculated centrality metrics.
         """
-        # get blocks diversity and connectivity indices
+        # fetch services once and reuse the per-block counts for both indices
         blocks = self.city_model.get_blocks_gdf(True)
-        blocks[DIVERSITY_COLUMN] = self.diversity[DIVERSITY_COLUMN]
-        blocks[CONNECTIVITY_COLUMN] = self.connectivity[CONNECTIVITY_COLUMN]
+        services = self.city_model.get_services_gdf()
+        services_per_block = services.groupby(["block_id", "service_type"]).size().unstack(fill_value=0)
+
+        blocks[DIVERSITY_COLUMN] = services_per_block.apply(Diversity._shannon_index, axis=1)
+        blocks[CONNECTIVITY_COLUMN] = self.city_model.accessibility_matrix.median(axis=1)
 
         # calculate density as amount of services in each block
-        services = self.city_model.get_services_gdf()
-        blocks[DENSITY_COLUMN] = services.groupby("block_id").size() / blocks["site_area"]
+        blocks[DENSITY_COLUMN] = services_per_block.sum(axis=1) / blocks["site_area"]
 
         # normalize indices and calculate centrality index
         scaler = MinMaxScaler()
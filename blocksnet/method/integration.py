@@ -89,8 +89,8 @@ class Integration(BaseMethod):
             blocks_gdf = city.get_blocks_gdf()
             blocks_gdf.geometry = blocks_gdf.buffer(BLOCKS_GRAPH_FETCH_BUFFER)
             unary_union = blocks_gdf.unary_union
-            polygon_gdf = gpd.GeoDataFrame([{"geometry": unary_union}], crs=blocks_gdf.crs).to_crs(4326)
-            polygon = shapely.make_valid(polygon_gdf.loc[0, "geometry"])
+            polygon_series = gpd.GeoSeries([unary_union], crs=blocks_gdf.crs).to_crs(4326)
+            polygon = shapely.make_valid(polygon_series.iloc[0])
             graph = ox.graph_from_polygon(polygon=polygon, simplify=True, network_type="drive")
             model["graph"] = ox.project_graph(graph, city.crs)
         else:
@@ -246,7 +246,6 @@ class Integration(BaseMethod):
         integration_gdf.geometry = integration_gdf.geometry.centroid  # .buffer(5)
 
         merged = gpd.sjoin_nearest(blocks, integration_gdf, how="left")
-        avg_local_integration = merged.groupby("id").agg({INTEGRATION_COLUMN: "mean"})
-        blocks[INTEGRATION_COLUMN] = avg_local_integration[INTEGRATION_COLUMN]
+        blocks[INTEGRATION_COLUMN] = merged.groupby("id")[INTEGRATION_COLUMN].mean()
 
         return blocks
@@ -1,7 +1,6 @@
 import numpy as np
 import geopandas as gpd
 import pandas as pd
-from tqdm import trange
 from sklearn.metrics.pairwise import cosine_similarity
 
 from ..models.land_use import LandUse
@@ -85,7 +84,7 @@ class LandUsePrediction(BaseMethod):
         for service_type in self.city_model.service_types:
             column = f"capacity_{service_type.name}"
             if column in blocks.columns:
-                blocks_profiles[service_type.name] = blocks[column].apply(lambda x: x > 0)
+                blocks_profiles[service_type.name] = blocks[column] > 0
             else:
                 blocks_profiles[service_type.name] = False
         # blocks_profiles['block_id'] = blocks_profiles.index
@@ -180,7 +179,9 @@ class LandUsePrediction(BaseMethod):
             return (predicted_landuse, predicted_landuse_probability)
         return predicted_landuse
 
-    def _predict_block_landuse(self, codes_in_block, landuse_items, use_cos_similarity=True):
+    def _predict_block_landuse(
+        self, codes_in_block, landuse_items, unique_per_landuse, items_header, landuse_vectors, use_cos_similarity=True
+    ):
         """
         Predicts the land use for a block.
 
@@ -190,6 +191,12 @@ class LandUsePrediction(BaseMethod):
             List of service tags or service codes present in a block.
         landuse_items : dict
             Dictionary containing service codes or service tags for each land use.
+        unique_per_landuse : dict
+            Dictionary with land use categories as keys and sets of unique service tags as values.
+        items_header : np.array
+            Array of all service tags over all land uses, defining the vectors order.
+        landuse_vectors : dict
+            Dictionary containing vectors representing services present in each land use.
         use_cos_similarity : bool, optional
             Use cosine similarity to predict unpredicted land uses for blocks, by default True.
 
@@ -203,7 +210,6 @@ class LandUsePrediction(BaseMethod):
             return None
 
         potential_landuse_categories = []
-        unique_per_landuse = self._get_unique_per_landuse(landuse_items)
         landuse_categories = landuse_items.keys()
         for landuse_category in landuse_categories:
             if self._intersects(codes_in_block, unique_per_landuse[landuse_category]):
@@ -213,16 +219,12 @@ class LandUsePrediction(BaseMethod):
             return potential_landuse_categories[0]
 
         if len(potential_landuse_categories) > 1:
-            landuse_categories = potential_landuse_categories
-            vector_header = np.array([j for i in landuse_items.values() for j in i])
-            landuse_vectors = {y: [x in landuse_items[y] for x in vector_header] for y in landuse_categories}
-            block_vector = [x in codes_in_block for x in vector_header]
-            return self._predict_block_landuse_cosine_similarity(block_vector, landuse_vectors, return_prob=False)
+            potential_vectors = {y: landuse_vectors[y] for y in potential_landuse_categories}
+            block_vector = np.isin(items_header, codes_in_block)
+            return self._predict_block_landuse_cosine_similarity(block_vector, potential_vectors, return_prob=False)
 
         elif use_cos_similarity:
-            vector_header = np.array([j for i in landuse_items.values() for j in i])
-            landuse_vectors = {y: [x in landuse_items[y] for x in vector_header] for y in landuse_categories}
-            block_vector = [x in codes_in_block for x in vector_header]
+            block_vector = np.isin(items_header, codes_in_block)
             return self._predict_block_landuse_cosine_similarity(block_vector, landuse_vectors, return_prob=False)
 
         else:
@@ -245,13 +247,21 @@ class LandUsePrediction(BaseMethod):
 
         blocks_profiles = self._get_blocks_gdf()
         landuse_items = self._get_land_uses_services()
+        unique_per_landuse = self._get_unique_per_landuse(landuse_items)
+
+        # the land use vectors do not depend on the block being predicted
+        items_header = np.array([j for i in landuse_items.values() for j in i])
+        landuse_vectors = {lu: np.isin(items_header, landuse_items[lu]) for lu in landuse_items}
 
         vector_header = np.array(blocks_profiles.drop(["geometry"], axis=1).columns)
+        profiles = blocks_profiles[vector_header].to_numpy(dtype=bool)
 
         landuse_predictions = []
-        for i in trange(len(blocks_profiles)):
-            items_in_block = vector_header[blocks_profiles[vector_header].iloc[i]]
-            landuse_prediction = self._predict_block_landuse(items_in_block, landuse_items, use_cos_similarity)
+        for i in range(len(blocks_profiles)):
+            items_in_block = vector_header[profiles[i]]
+            landuse_prediction = self._predict_block_landuse(
+                items_in_block, landuse_items, unique_per_landuse, items_header, landuse_vectors, use_cos_similarity
+            )
             landuse_predictions.append(landuse_prediction)
 
         res = blocks_profiles[["geometry"]].copy()
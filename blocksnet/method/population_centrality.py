@@ -1,8 +1,8 @@
 import geopandas as gpd
 import networkx as nx
 import numpy as np
+import shapely
 from scipy.spatial import cKDTree
-from shapely import Point
 from sklearn.preprocessing import MinMaxScaler
 from .base_method import BaseMethod
 
@@ -67,23 +67,18 @@ class PopulationCentrality(BaseMethod):
         """
         # get blocks and find neighbors in radius
         blocks = self.city_model.get_blocks_gdf()
-        points = np.array([(point.x, point.y) for point in blocks.geometry.centroid])
+        points = shapely.get_coordinates(blocks.geometry.centroid)
         tree = cKDTree(points)
         pairs = tree.query_pairs(r=connectivity_radius)
         # graph creation and centrality calc
         connectivity_graph = nx.Graph()
-        for idx, point in enumerate(points):
-            connectivity_graph.add_node(idx, pos=(point[0], point[1]))
-        for i, j in pairs:
-            connectivity_graph.add_edge(i, j)
+        connectivity_graph.add_nodes_from(range(len(points)))
+        connectivity_graph.add_edges_from(pairs)
         centrality = nx.degree_centrality(connectivity_graph)
 
-        # connect graph and blocks
-        nodes = gpd.GeoDataFrame(
-            geometry=[Point(position["pos"]) for _, position in connectivity_graph.nodes(data=True)], crs=blocks.crs
-        )
-        nodes[POPULATION_CENTRALITY_COLUMN] = centrality
-        blocks_out = gpd.sjoin(blocks, nodes, how="left", predicate="intersects")
+        # graph nodes are the blocks' own centroids, so centrality maps to blocks positionally
+        blocks_out = blocks.copy()
+        blocks_out[POPULATION_CENTRALITY_COLUMN] = [centrality[idx] for idx in range(len(blocks_out))]
 
         # normalize values
         data = blocks_out[POPULATION_CENTRALITY_COLUMN].values.astype(float).reshape(-1, 1)
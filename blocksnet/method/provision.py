@@ -3,8 +3,10 @@ Service type provisions assessment module.
 """
 from loguru import logger
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from pulp import PULP_CBC_CMD, LpMaximize, LpProblem, LpVariable, lpSum, LpInteger
+from pulp import PULP_CBC_CMD, HiGHS_CMD, LpAffineExpression, LpMaximize, LpProblem, LpVariable, lpSum, LpInteger
+from pydantic import PrivateAttr
 from ..models import ServiceType
 from .base_method import BaseMethod
 from enum import Enum
@@ -14,6 +16,22 @@ PROVISION_COLUMN = "provision"
 PLOT_KWARGS = {"column": PROVISION_COLUMN, "cmap": "RdYlGn", "vmin": 0, "vmax": 1, "legend": True}
 
 
+def _get_solver():
+    """
+    Returns the fastest available LP solver: HiGHS if its binary is installed,
+    the bundled CBC otherwise.
+
+    Returns
+    -------
+    pulp.LpSolver
+        Solver instance to be used for provision problems.
+    """
+    solver = HiGHS_CMD(msg=False)
+    if solver.available():
+        return solver
+    return PULP_CBC_CMD(msg=False)
+
+
 class ProvisionMethod(Enum):
     """
     Enum for different methods of service provision assessment.
@@ -60,6 +78,25 @@ class Provision(BaseMethod):
         Performs provision assessment for a specified service type and method.
     """
 
+    _blocks_gdf: gpd.GeoDataFrame | None = PrivateAttr(default=None)
+
+    @property
+    def blocks_gdf(self) -> gpd.GeoDataFrame:
+        """
+        Blocks GeoDataFrame snapshot, fetched from the city model once per Provision instance.
+
+        The snapshot is taken lazily on first access and reused by subsequent
+        calculations, so the instance should be recreated if the city model changes.
+
+        Returns
+        -------
+        geopandas.GeoDataFrame
+            GeoDataFrame containing blocks data.
+        """
+        if self._blocks_gdf is None:
+            self._blocks_gdf = self.city_model.get_blocks_gdf()
+        return self._blocks_gdf
+
     def plot(self, gdf: gpd.GeoDataFrame, linewidth: float = 0.1, figsize: tuple[int, int] = (10, 10)):
         """
         Visualizes provision assessment results for a given GeoDataFrame.
@@ -99,14 +136,17 @@ class Provision(BaseMethod):
             GeoDataFrame containing the geometry, demand, and capacity for each block.
         """
         capacity_column = f"capacity_{service_type.name}"
-        gdf = self.city_model.get_blocks_gdf()[["geometry", "population", capacity_column]].fillna(0)
+        gdf = self.blocks_gdf[["geometry", "population", capacity_column]].copy()
         gdf = gdf.rename(columns={capacity_column: "capacity"})
+        # only the numeric columns may contain NaN, no need to scan the geometry
+        gdf["population"] = np.nan_to_num(gdf["population"])
+        gdf["capacity"] = np.nan_to_num(gdf["capacity"])
         if update_df is not None:
             if "population" in update_df.columns:
                 gdf["population"] = gdf["population"].add(update_df["population"].fillna(0), fill_value=0)
             if service_type.name in update_df.columns:
                 gdf["capacity"] = gdf["capacity"].add(update_df[service_type.name].fillna(0), fill_value=0)
-        gdf["population"] = gdf["population"].apply(service_type.calculate_in_need)
+        gdf["population"] = service_type.calculate_in_need_vector(gdf["population"].to_numpy())
         gdf = gdf.rename(columns={"population": "demand"})
         gdf["capacity_left"] = gdf["capacity"]
         gdf["demand_left"] = gdf["demand"]
@@ -172,9 +212,8 @@ class Provision(BaseMethod):
             The lower bound of provision as the ratio of the total met demand
             (limited by capacity) to the total demand.
         """
-        gdf = gdf.copy()
-        gdf["demand_within"] = gdf.apply(lambda x: min(x["capacity"], x["demand"]), axis=1)
-        return gdf["demand_within"].sum() / gdf["demand"].sum()
+        demand_within = np.minimum(gdf["capacity"].to_numpy(), gdf["demand"].to_numpy())
+        return demand_within.sum() / gdf["demand"].sum()
 
     @staticmethod
     def _get_upper_bound(gdf: gpd.GeoDataFrame) -> float:
@@ -253,7 +292,7 @@ class Provision(BaseMethod):
         gdf = self._get_blocks_gdf(service_type, update_df)
 
         if self_supply:
-            supply: pd.Series = gdf.apply(lambda x: min(x["demand"], x["capacity"]), axis=1)
+            supply = np.minimum(gdf["demand"], gdf["capacity"])
             gdf["demand_within"] += supply
             gdf["demand_left"] -= supply
             gdf["capacity_left"] -= supply
@@ -303,36 +342,38 @@ class Provision(BaseMethod):
         if selection_range is None:
             selection_range = service_type.accessibility
 
-        def _get_distance(id1: int, id2: int):
-            distance = self.city_model.accessibility_matrix.loc[id1, id2]
-            return distance if distance > 1 else 1
-
-        def _get_weight(id1: int, id2: int):
-            distance = _get_distance(id1, id2)
-            if method == ProvisionMethod.LINEAR:
-                return 1 / distance
-            return 1 / (distance * distance)
-
         demand = gdf.loc[gdf["demand_left"] > 0]
         capacity = gdf.loc[gdf["capacity_left"] > 0]
 
+        # hoist the accessibility submatrix out of the per-pair lookups
+        distance_mx = np.maximum(
+            self.city_model.accessibility_matrix.loc[demand.index, capacity.index].to_numpy(), 1
+        )
+        demand_pos = {block_id: i for i, block_id in enumerate(demand.index)}
+        capacity_pos = {block_id: j for j, block_id in enumerate(capacity.index)}
+
+        if method == ProvisionMethod.LINEAR:
+            weight_mx = 1 / distance_mx
+        else:
+            weight_mx = 1 / (distance_mx * distance_mx)
+
         if self.verbose:
             logger.info(f"Setting an LP problem for accessibility = {selection_range} : {len(demand)}x{len(capacity)}")
 
         prob = LpProblem("Provision", LpMaximize)
-        # Precompute distance and filter products
-        products = [
-            (i, j)
-            for i in demand.index
-            for j in capacity.index
-            if _get_distance(i, j) <= selection_range  # service_type.accessibility * 2
-        ]
+        # Filter reachable pairs in matrix form
+        pairs = np.argwhere(distance_mx <= selection_range)  # service_type.accessibility * 2
+        demand_ids = demand.index.to_numpy()
+        capacity_ids = capacity.index.to_numpy()
+        products = list(zip(demand_ids[pairs[:, 0]], capacity_ids[pairs[:, 1]]))
+        weights = weight_mx[pairs[:, 0], pairs[:, 1]]
 
         # Create the decision variable dictionary
         x = LpVariable.dicts("Route", products, 0, None, cat=LpInteger)
 
-        # Objective Function
-        prob += lpSum(_get_weight(n, m) * x[n, m] for n, m in products)
+        # Objective Function, built as one affine expression to avoid
+        # the quadratic cost of summing LP terms pairwise
+        prob += LpAffineExpression((x[product], weight) for product, weight in zip(products, weights))
 
         # Constraint dictionaries
         demand_constraints = {n: [] for n in demand.index}
@@ -352,26 +393,31 @@ class Provision(BaseMethod):
 
         if self.verbose:
             logger.info("Solving the problem")
-        prob.solve(PULP_CBC_CMD(msg=False))
+        prob.solve(_get_solver())
 
         if self.verbose:
             logger.info("Restoring values from variables")
 
-        for var in prob.variables():
+        demand_within = np.zeros(len(demand))
+        demand_without = np.zeros(len(demand))
+        capacity_taken = np.zeros(len(capacity))
+
+        for (a, b), var in x.items():
             value = var.value()
-            name = var.name.replace("(", "").replace(")", "").replace(",", "").split("_")
-            if name[2] == "dummy":
+            if not value or value <= 0:
                 continue
-            a = int(name[1])
-            b = int(name[2])
-            distance = _get_distance(a, b)
-            if value > 0:
-                if distance <= service_type.accessibility:
-                    gdf.loc[a, "demand_within"] += value
-                else:
-                    gdf.loc[a, "demand_without"] += value
-                gdf.loc[a, "demand_left"] -= value
-                gdf.loc[b, "capacity_left"] -= value
+            i = demand_pos[a]
+            j = capacity_pos[b]
+            if distance_mx[i, j] <= service_type.accessibility:
+                demand_within[i] += value
+            else:
+                demand_without[i] += value
+            capacity_taken[j] += value
+
+        gdf.loc[demand.index, "demand_within"] += demand_within
+        gdf.loc[demand.index, "demand_without"] += demand_without
+        gdf.loc[demand.index, "demand_left"] -= demand_within + demand_without
+        gdf.loc[capacity.index, "capacity_left"] -= capacity_taken
 
         if gdf["demand_left"].sum() > 0 and gdf["capacity_left"].sum() > 0:
             return self._lp_provision(gdf, service_type, method, selection_range * 2)
@@ -400,7 +446,16 @@ class Provision(BaseMethod):
         demand_blocks = [self.city_model[i] for i in demand_gdf.index]
         capacity_blocks = [self.city_model[i] for i in capacity_gdf.index]
 
-        while gdf["demand_left"].sum() > 0 and gdf["capacity_left"].sum() > 0:
+        # keep the per-unit bookkeeping in plain dicts and scalar totals,
+        # writing the columns back only once the allocation is done
+        demand_left = gdf["demand_left"].to_dict()
+        demand_within = gdf["demand_within"].to_dict()
+        demand_without = gdf["demand_without"].to_dict()
+        capacity_left = gdf["capacity_left"].to_dict()
+        total_demand_left = sum(demand_left.values())
+        total_capacity_left = sum(capacity_left.values())
+
+        while total_demand_left > 0 and total_capacity_left > 0:
 
             for demand_block in demand_blocks:
                 if len(capacity_blocks) == 0:
@@ -409,19 +464,26 @@ class Provision(BaseMethod):
                     capacity_blocks, key=lambda capacity_block: self.city_model[demand_block, capacity_block]
                 )
 
-                gdf.loc[demand_block.id, "demand_left"] -= 1
+                demand_left[demand_block.id] -= 1
+                total_demand_left -= 1
                 distance = self.city_model[demand_block, capacity_block]
                 if distance <= service_type.accessibility:
-                    gdf.loc[demand_block.id, "demand_within"] += 1
+                    demand_within[demand_block.id] += 1
                 else:
-                    gdf.loc[demand_block.id, "demand_without"] += 1
+                    demand_without[demand_block.id] += 1
                 # remove block if it's demand_left is empty
-                if gdf.loc[demand_block.id, "demand_left"] == 0:
+                if demand_left[demand_block.id] == 0:
                     demand_blocks.remove(demand_block)
 
-                gdf.loc[capacity_block.id, "capacity_left"] -= 1
+                capacity_left[capacity_block.id] -= 1
+                total_capacity_left -= 1
                 # remove block if its capacity_left is empty
-                if gdf.loc[capacity_block.id, "capacity_left"] == 0:
+                if capacity_left[capacity_block.id] == 0:
                     capacity_blocks.remove(capacity_block)
 
+        gdf["demand_left"] = pd.Series(demand_left)
+        gdf["demand_within"] = pd.Series(demand_within)
+        gdf["demand_without"] = pd.Series(demand_without)
+        gdf["capacity_left"] = pd.Series(capacity_left)
+
         return gdf
@@ -104,19 +104,19 @@ class Spacematrix(BaseMethod):
         return blocks
 
     @staticmethod
-    def _name_spacematrix_morphotypes(cluster) -> str:
+    def _name_spacematrix_morphotypes(clusters) -> pd.Series:
         """
-        Assigns names to Spacematrix morphotypes based on cluster data.
+        Assigns names to Spacematrix morphotypes based on clusters median values.
 
         Parameters
         ----------
-        cluster : pandas.Series
-            Series containing cluster data for each block.
+        clusters : pandas.DataFrame
+            DataFrame containing median ``l``, ``fsi`` and ``mxi`` values for each cluster.
 
         Returns
         -------
-        str
-            The name of the Spacematrix morphotype.
+        pandas.Series
+            Series containing the name of the Spacematrix morphotype for each cluster.
         """
         ranges = [[0, 3, 6, 10, 17], [0, 1, 2], [0, 0.22, 0.55]]
         labels = [
@@ -124,12 +124,11 @@ class Spacematrix(BaseMethod):
             [" низкоплотный", "", " плотный"],
             [" нежилой", " смешанный", " жилой"],
         ]
-        cluster_name = []
-        for ind in range(len(cluster)):
-            cluster_name.append(
-                labels[ind][[i for i in range(len(ranges[ind])) if cluster.iloc[ind] >= ranges[ind][i]][-1]]
-            )
-        return "".join(cluster_name)
+        names = pd.Series("", index=clusters.index)
+        for column, column_ranges, column_labels in zip(["l", "fsi", "mxi"], ranges, labels):
+            label_idxs = np.clip(np.searchsorted(column_ranges, clusters[column], side="right") - 1, 0, None)
+            names += np.array(column_labels)[label_idxs]
+        return names
 
     def _get_spacematrix_morphotypes(self, blocks) -> gpd.GeoDataFrame:
         """
@@ -152,7 +151,7 @@ class Spacematrix(BaseMethod):
         x["cluster"] = kmeans.labels_
         blocks = blocks.join(x["cluster"])
         cluster_grouper = blocks.groupby(["cluster"]).median(numeric_only=True)
-        named_clusters = cluster_grouper[["l", "fsi", "mxi"]].apply(self._name_spacematrix_morphotypes, axis=1)
+        named_clusters = self._name_spacematrix_morphotypes(cluster_grouper[["l", "fsi", "mxi"]])
         blocks = blocks.join(named_clusters.rename("morphotype"), on="cluster")
 
         return blocks
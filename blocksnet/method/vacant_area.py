@@ -2,13 +2,29 @@
 Identify vacant areas within specified blocks.
 """
 import geopandas as gpd
+import numpy as np
 import osmnx as ox
 import pandas as pd
+import shapely
 from pydantic import Field
 
 from ..models import Block
 from .base_method import BaseMethod
 
+OCCUPIED_TAGS = {
+    "man_made": True,
+    "aeroway": True,
+    "military": True,
+    "leisure": True,
+    "landuse": True,
+    "amenity": True,
+    "building": True,
+    "natural": True,
+    "waterway": True,
+    "highway": True,
+    "railway": True,
+}
+
 
 class VacantArea(BaseMethod):
     """
@@ -48,122 +64,14 @@ class VacantArea(BaseMethod):
     blocks_buffer_min: float = Field(ge=0, default=20)
     blocks_buffer_max: float = Field(ge=0, default=40)
 
-    def _dwn_other(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download non-standard areas within a block.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with the geometries of non-standard areas.
-        """
-        try:
-            other = ox.features_from_polygon(geometry, tags={"man_made": True, "aeroway": True, "military": True})
-            other = other.to_crs(self.city_model.crs)
-            return other[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
-
-    def _dwn_leisure(self, geometry) -> gpd.GeoSeries:
-        """
-        Download leisure areas within a block.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoSeries
-            A GeoSeries with the geometries of leisure areas.
-        """
-        try:
-            leisure = ox.features_from_polygon(geometry, tags={"leisure": True})
-            leisure = leisure.to_crs(self.city_model.crs)
-            return leisure[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
-
-    def _dwn_landuse(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download land use areas within a block, excluding residential areas.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with the geometries of non-residential land use areas.
-        """
-        try:
-            landuse = ox.features_from_polygon(geometry, tags={"landuse": True})
-            if not landuse.empty:
-                landuse = landuse[landuse["landuse"] != "residential"]
-            landuse = landuse.to_crs(self.city_model.crs)
-            return landuse[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
-
-    def _dwn_amenity(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download amenity areas within a block.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with the geometries of amenity areas.
-        """
-        try:
-            amenity = ox.features_from_polygon(geometry, tags={"amenity": True})
-            amenity = amenity.to_crs(self.city_model.crs)
-            return amenity[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoSeries()
-
-    def _dwn_buildings(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download building areas within a block and apply a buffer.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with buffered building geometries.
+    def _dwn_occupied(self, geometry) -> gpd.GeoDataFrame:
         """
-        try:
-            buildings = ox.features_from_polygon(geometry, tags={"building": True})
-            buildings = buildings.to_crs(self.city_model.crs)
-            buildings["geometry"] = buildings["geometry"].buffer(self.buildings_buffer)
-            return buildings[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoSeries()
+        Download all occupied areas within a block in a single OSM request.
 
-    def _dwn_natural(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download natural feature areas within a block, excluding bays.
+        Features are fetched for all occupied tags at once and then filtered
+        and buffered per tag: residential land use, bays, subways and
+        pedestrian highways are dropped, while buildings, roads and paths get
+        their respective buffers.
 
         Parameters
         ----------
@@ -173,113 +81,43 @@ class VacantArea(BaseMethod):
         Returns
         -------
         gpd.GeoDataFrame
-            A GeoDataFrame with the geometries of natural feature areas.
+            A GeoDataFrame with the geometries of occupied areas.
         """
         try:
-            natural = ox.features_from_polygon(geometry, tags={"natural": True})
-            if not natural.empty:
-                natural = natural[natural["natural"] != "bay"]
-            natural = natural.to_crs(self.city_model.crs)
-            return natural[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
-
-    def _dwn_waterway(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download waterway areas within a block.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with the geometries of waterway areas.
-        """
-        try:
-            waterway = ox.features_from_polygon(geometry, tags={"waterway": True})
-            waterway = waterway.to_crs(self.city_model.crs)
-            return waterway[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
-
-    def _dwn_highway(self, block) -> gpd.GeoDataFrame:
-        """
-        Download highway areas within a block, applying a buffer and excluding certain types of highways.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with buffered highway geometries.
-        """
-        try:
-            highway = ox.features_from_polygon(block, tags={"highway": True})
-            condition = (
-                (highway["highway"] != "path")
-                & (highway["highway"] != "footway")
-                & (highway["highway"] != "pedestrian")
+            features = ox.features_from_polygon(geometry, tags=OCCUPIED_TAGS)
+            features = features.to_crs(self.city_model.crs)
+
+            def tagged(column: str) -> pd.Series:
+                if column in features.columns:
+                    return features[column].notna()
+                return pd.Series(False, index=features.index)
+
+            keep = (
+                tagged("man_made")
+                | tagged("aeroway")
+                | tagged("military")
+                | tagged("leisure")
+                | tagged("amenity")
+                | tagged("waterway")
             )
-            filtered_highway = highway[condition]
-            filtered_highway = filtered_highway.to_crs(self.city_model.crs)
-            filtered_highway["geometry"] = filtered_highway["geometry"].buffer(self.roads_buffer)
-            return filtered_highway[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
+            keep |= tagged("landuse") & (features.get("landuse") != "residential")
+            keep |= tagged("natural") & (features.get("natural") != "bay")
+            keep |= tagged("railway") & (features.get("railway") != "subway")
 
-    def _dwn_path(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download path and footway areas within a block and apply a buffer.
-
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
-
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with buffered path and footway geometries.
-        """
-        try:
-            tags = {"highway": "path", "highway": "footway"}
-            path = ox.features_from_polygon(geometry, tags=tags)
-            path = path.to_crs(self.city_model.crs)
-            path["geometry"] = path["geometry"].buffer(self.path_buffer)
-            return path[["geometry"]]
-        except (ValueError, AttributeError) as exc:
-            print(f"Error encountered: {exc}")
-            return gpd.GeoDataFrame()
+            geometries = features.geometry.copy()
 
-    def _dwn_railway(self, geometry) -> gpd.GeoDataFrame:
-        """
-        Download railway areas within a block, excluding subways.
+            building_mask = tagged("building")
+            geometries[building_mask] = geometries[building_mask].buffer(self.buildings_buffer)
+            keep |= building_mask
 
-        Parameters
-        ----------
-        geometry : gpd.GeoSeries
-            The polygon geometry of the block.
+            if "highway" in features.columns:
+                path_mask = features["highway"].isin(["path", "footway"])
+                road_mask = tagged("highway") & ~path_mask & (features["highway"] != "pedestrian")
+                geometries[path_mask] = geometries[path_mask].buffer(self.path_buffer)
+                geometries[road_mask] = geometries[road_mask].buffer(self.roads_buffer)
+                keep |= path_mask | road_mask
 
-        Returns
-        -------
-        gpd.GeoDataFrame
-            A GeoDataFrame with the geometries of railway areas.
-        """
-        try:
-            railway = ox.features_from_polygon(geometry, tags={"railway": True})
-            if not railway.empty:
-                railway = railway[railway["railway"] != "subway"]
-            railway = railway.to_crs(self.city_model.crs)
-            return railway[["geometry"]]
+            return gpd.GeoDataFrame(geometry=geometries[keep])
         except (ValueError, AttributeError) as exc:
             print(f"Error encountered: {exc}")
             return gpd.GeoDataFrame()
@@ -313,44 +151,45 @@ class VacantArea(BaseMethod):
         buildings_gdf["geometry"] = buildings_gdf["geometry"].buffer(self.buildings_buffer)
         blocks_buffer = blocks_gdf.buffer(self.blocks_buffer_min).to_crs(epsg=4326).unary_union
 
-        # setting occupied area with all the buffers possible
+        # setting occupied area with all the buffers possible,
+        # downloading all the OSM features in one request
         occupied_areas = [
             buildings_gdf,
             services_gdf,
-            self._dwn_other(blocks_buffer),
-            self._dwn_landuse(blocks_buffer),
-            self._dwn_natural(blocks_buffer),
-            self._dwn_waterway(blocks_buffer),
-            self._dwn_highway(blocks_buffer),
-            self._dwn_railway(blocks_buffer),
-            self._dwn_path(blocks_buffer),
-            self._dwn_leisure(blocks_buffer),
-            self._dwn_amenity(blocks_buffer),
-            self._dwn_buildings(blocks_buffer),
+            self._dwn_occupied(blocks_buffer),
         ]
         occupied_area = pd.concat(occupied_areas)[["geometry"]]
-        occupied_area = occupied_area.loc[occupied_area.geom_type.isin(["Polygon", "MultiPolygon"])]
+        type_ids = shapely.get_type_id(occupied_area.geometry.values)
+        polygonal = np.isin(type_ids, (shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON))
+        occupied_area = occupied_area.loc[polygonal]
         buffered_blocks_gdf = blocks_gdf.copy()
         buffered_blocks_gdf["geometry"] = buffered_blocks_gdf["geometry"].buffer(self.blocks_buffer_max)
 
-        vacant_gdf = blocks_gdf.overlay(occupied_area, how="difference")
-        # vacant_gdf = blocks_gdf.overlay(vacant_gdf, how="intersection")
-        unified_geometry = vacant_gdf["geometry"].buffer(1.1).unary_union
+        # subtracting the unioned occupied geometry at once is much cheaper
+        # than a pairwise overlay difference
+        occupied_geometry = occupied_area.unary_union
+        vacant_geometry = blocks_gdf.geometry.difference(occupied_geometry)
+        unified_geometry = vacant_geometry.buffer(1.1).unary_union
         vacant_gdf = gpd.GeoDataFrame(geometry=[unified_geometry], crs=self.city_model.crs)
-        vacant_gdf = vacant_gdf.explode(index_parts=True).reset_index(drop=True)
+        vacant_gdf = vacant_gdf.explode(ignore_index=True)
 
         # calculate filtering indicators
         vacant_gdf["area"] = vacant_gdf["geometry"].area
-        vacant_gdf["mrr_area"] = vacant_gdf["geometry"].apply(lambda g: g.minimum_rotated_rectangle.area)
-        vacant_gdf["length"] = vacant_gdf["geometry"].apply(lambda g: g.length)
+        vacant_gdf["mrr_area"] = shapely.area(shapely.oriented_envelope(vacant_gdf["geometry"].values))
+        vacant_gdf["length"] = vacant_gdf["geometry"].length
         vacant_gdf["area_to_length"] = vacant_gdf["area"] / vacant_gdf["length"]
         vacant_gdf["area_to_mrr_area"] = vacant_gdf["area"] / vacant_gdf["mrr_area"]
 
-        result_gdf = vacant_gdf.loc[vacant_gdf["area"] >= self.area_min]
-        result_gdf = result_gdf.loc[vacant_gdf["area_to_mrr_area"] >= self.area_to_mrr_area_min]
-        result_gdf = result_gdf.loc[vacant_gdf["area_to_length"] >= self.area_to_length_min]
-
-        result_gdf = result_gdf.sjoin(blocks_gdf, how="left", predicate="within")
-        result_gdf = result_gdf.rename(columns={"index_right": "block_id"})
+        mask = (
+            (vacant_gdf["area"] >= self.area_min)
+            & (vacant_gdf["area_to_mrr_area"] >= self.area_to_mrr_area_min)
+            & (vacant_gdf["area_to_length"] >= self.area_to_length_min)
+        )
+        result_gdf = vacant_gdf.loc[mask].copy()
+
+        result_idxs, block_idxs = blocks_gdf.sindex.query(result_gdf.geometry, predicate="within")
+        block_ids = pd.Series(np.nan, index=result_gdf.index)
+        block_ids.iloc[result_idxs] = blocks_gdf.index.to_numpy()[block_idxs]
+        result_gdf["block_id"] = block_ids
 
         return result_gdf.reset_index(drop=True)
@@ -5,7 +5,6 @@ import math
 import pickle
 from functools import singledispatchmethod
 from typing import Literal
-from tqdm import tqdm
 from loguru import logger
 import geopandas as gpd
 import pandas as pd
@@ -18,6 +17,24 @@ from ..utils import SERVICE_TYPES
 from .service_type import ServiceType, ServiceBrick
 from .land_use import LandUse
 
+_default_service_types: list[ServiceType] | None = None
+
+
+def _get_default_service_types() -> list[ServiceType]:
+    """
+    Validate the default service types catalogue once and share it between
+    City instances, since the catalogue itself is never mutated.
+
+    Returns
+    -------
+    list of ServiceType
+        Default service types list.
+    """
+    global _default_service_types
+    if _default_service_types is None:
+        _default_service_types = [ServiceType(**st) for st in SERVICE_TYPES]
+    return _default_service_types
+
 
 class Service(ABC, BaseModel):
     """
@@ -344,10 +361,10 @@ class Building(BaseModel):
         if gdf is None:
             self.services = list(filter(lambda s: s.service_type != service_type, self.services))
         else:
-            services = []
-            for i in gdf.index:
-                service = BuildingService(service_type=service_type, building=self, **gdf.loc[i].to_dict())
-                services.append(service)
+            services = [
+                BuildingService(service_type=service_type, building=self, **row)
+                for row in gdf.to_dict("index").values()
+            ]
             self.services = [*self.services, *services]
 
     def to_dict(self) -> dict:
@@ -460,7 +477,7 @@ class Block(BaseModel):
         int
             Total population of the block.
         """
-        return sum([b.population for b in self.buildings], 0)
+        return sum(b.population for b in self.buildings)
 
     @property
     def footprint_area(self) -> float:
@@ -472,7 +489,7 @@ class Block(BaseModel):
         float
             Total footprint area of the buildings in square meters.
         """
-        return sum([b.footprint_area for b in self.buildings], 0)
+        return sum(b.footprint_area for b in self.buildings)
 
     @property
     def build_floor_area(self) -> float:
@@ -484,7 +501,7 @@ class Block(BaseModel):
         float
             Total build floor area of the buildings in square meters.
         """
-        return sum([b.build_floor_area for b in self.buildings], 0)
+        return sum(b.build_floor_area for b in self.buildings)
 
     @property
     def living_area(self) -> float:
@@ -496,7 +513,7 @@ class Block(BaseModel):
         float
             Total living area of the buildings in square meters.
         """
-        return sum([b.living_area for b in self.buildings], 0)
+        return sum(b.living_area for b in self.buildings)
 
     @property
     def non_living_area(self) -> float:
@@ -508,7 +525,7 @@ class Block(BaseModel):
         float
             Total non-living area of the buildings in square meters.
         """
-        return sum([b.non_living_area for b in self.buildings], 0)
+        return sum(b.non_living_area for b in self.buildings)
 
     @property
     def is_living(self) -> bool:
@@ -520,7 +537,7 @@ class Block(BaseModel):
         bool
             True if there is at least one living building, False otherwise.
         """
-        return any([b.is_living for b in self.buildings])
+        return any(b.is_living for b in self.buildings)
 
     @property
     def living_demand(self) -> float | None:
@@ -698,14 +715,11 @@ class Block(BaseModel):
         dict
             Dictionary containing service capacities by type.
         """
-        service_types = dict.fromkeys([service.service_type for service in self.all_services], 0)
-
-        return {
-            f"capacity_{st.name}": sum(
-                map(lambda s: s.capacity, filter(lambda s: s.service_type == st, self.all_services))
-            )
-            for st in service_types
-        }
+        capacities = {}
+        for service in self.all_services:
+            column = f"capacity_{service.service_type.name}"
+            capacities[column] = capacities.get(column, 0) + service.capacity
+        return capacities
 
     @property
     def land_use_service_types(self) -> list[ServiceType]:
@@ -781,7 +795,7 @@ class Block(BaseModel):
         if gdf is None:
             self.buildings = []
         else:
-            self.buildings = [Building(id=i, **gdf.loc[i].to_dict(), block=self) for i in gdf.index]
+            self.buildings = [Building(id=i, **row, block=self) for i, row in gdf.to_dict("index").items()]
 
     def update_services(self, service_type: ServiceType, gdf: gpd.GeoDataFrame | None = None):
         """
@@ -797,10 +811,9 @@ class Block(BaseModel):
         if gdf is None:
             self.services = list(filter(lambda s: s.service_type != service_type, self.services))
         else:
-            services = []
-            for i in gdf.index:
-                service = BlockService(service_type=service_type, block=self, **gdf.loc[i].to_dict())
-                services.append(service)
+            services = [
+                BlockService(service_type=service_type, block=self, **row) for row in gdf.to_dict("index").values()
+            ]
             self.services = [*self.services, *services]
 
     @classmethod
@@ -825,10 +838,10 @@ class Block(BaseModel):
         dict of int : Block
             Dictionary mapping block IDs to Block instances.
         """
-        result = {}
-        for i in gdf.index:
-            result[i] = cls(id=i, geometry=gdf.loc[i].geometry, land_use=gdf.loc[i].land_use, city=city)
-        return result
+        return {
+            i: cls(id=i, geometry=geometry, land_use=land_use, city=city)
+            for i, geometry, land_use in zip(gdf.index, gdf.geometry, gdf.land_use)
+        }
 
     @singledispatchmethod
     def __getitem__(self, arg):
@@ -963,10 +976,7 @@ class City:
         self.crs = blocks.crs
         self._blocks = Block.from_gdf(blocks, self)
         self.accessibility_matrix = acc_mx.copy()
-        self._service_types = {}
-        for st in SERVICE_TYPES:
-            service_type = ServiceType(**st)
-            self._service_types[service_type.name] = service_type
+        self._service_types = {service_type.name: service_type for service_type in _get_default_service_types()}
 
     @property
     def epsg(self) -> int:
@@ -1160,13 +1170,12 @@ class City:
         blocks = [b.to_dict(simplify) for b in self.blocks]
         gdf = gpd.GeoDataFrame(blocks, crs=self.crs).set_index("id")
         if not simplify:
-            for service_type in self.service_types:
-                ...
-                capacity_column = f"capacity_{service_type.name}"
-                if not capacity_column in gdf.columns:
-                    gdf[capacity_column] = 0
-                else:
-                    gdf[capacity_column] = gdf[capacity_column].fillna(0)
+            capacity_columns = [f"capacity_{service_type.name}" for service_type in self.service_types]
+            existing_columns = [column for column in capacity_columns if column in gdf.columns]
+            missing_columns = [column for column in capacity_columns if column not in gdf.columns]
+            gdf[existing_columns] = gdf[existing_columns].fillna(0)
+            if len(missing_columns) > 0:
+                gdf = pd.concat([gdf, pd.DataFrame(0, index=gdf.index, columns=missing_columns)], axis=1)
         return gdf
 
     def update_land_use(self, gdf: gpd.GeoDataFrame) -> None:
@@ -1188,18 +1197,11 @@ class City:
         assert gdf.crs == self.crs, "LandUse GeoDataFrame CRS should match city CRS"
         assert gdf.index.isin(self._blocks.keys()).all(), "Index should match blocks IDs"
         assert len(gdf) == len(self.blocks), "Index length must match blocks length"
-        for i in gdf.index:
-            land_use = gdf.loc[i, "land_use"]
-
-            if isinstance(land_use, str):
-                land_use = land_use.lower()
-                land_use = land_use.replace("-", "_")
-                land_use = LandUse(land_use)
-            elif isinstance(land_use, LandUse):
-                ...
-            else:
-                land_use = None
-            self[i].land_use = land_use
+        land_uses = gdf["land_use"].copy()
+        str_mask = land_uses.apply(lambda lu: isinstance(lu, str))
+        land_uses[str_mask] = land_uses[str_mask].str.lower().str.replace("-", "_").map(LandUse)
+        for i, land_use in land_uses.items():
+            self[i].land_use = land_use if isinstance(land_use, LandUse) else None
 
     def update_buildings(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """
@@ -1241,19 +1243,18 @@ class City:
         logger.info("Joining buildings and blocks")
         sjoin = gdf.sjoin(self.get_blocks_gdf()[["geometry"]])
         sjoin = sjoin.rename(columns={"index_right": "block_id"})
-        sjoin.geometry = sjoin.geometry.apply(
-            lambda g: g.buffer(0) if g.geom_type in ["Polygon", "MultiPolygon"] else g
-        )
+        polygon_mask = sjoin.geom_type.isin(["Polygon", "MultiPolygon"])
+        sjoin.loc[polygon_mask, "geometry"] = sjoin.geometry[polygon_mask].buffer(0)
         sjoin["intersection_area"] = sjoin.apply(
-            lambda s: intersection(s.geometry, self[s.block_id].geometry), axis=1
+            lambda s: intersection(s.geometry, self._blocks[s.block_id].geometry), axis=1
         ).area
         sjoin["building_id"] = sjoin.index
         sjoin = sjoin.sort_values("intersection_area").drop_duplicates(subset="building_id", keep="last")
         if len(sjoin) < len(gdf):
             logger.warning(f"{len(gdf)-len(sjoin)} buildings did not intersect any block")
         groups = sjoin.groupby("block_id")
-        for block_id, buildings_gdf in tqdm(groups, desc="Update blocks buildings"):
-            self[int(block_id)].update_buildings(buildings_gdf)
+        for block_id, buildings_gdf in groups:
+            self._blocks[block_id].update_buildings(buildings_gdf)
         return gdf[~gdf.index.isin(sjoin.index)]
 
     def update_services(self, service_type: ServiceType | str, gdf: gpd.GeoDataFrame) -> None:
@@ -1294,39 +1295,37 @@ class City:
         buildings_gdf = self.get_buildings_gdf()
         building_services = gdf.sjoin(buildings_gdf[["geometry", "block_id"]])
         building_services = building_services.rename(columns={"index_right": "building_id"})
-        building_services.geometry = building_services.geometry.apply(
-            lambda g: g.buffer(0) if g.geom_type in ["Polygon", "MultiPolygon"] else g
-        )
+        polygon_mask = building_services.geom_type.isin(["Polygon", "MultiPolygon"])
+        building_services.loc[polygon_mask, "geometry"] = building_services.geometry[polygon_mask].buffer(0)
+        # index the buildings once instead of scanning block buildings per lookup
+        buildings_by_id = {building.id: building for building in self.buildings}
         building_services["intersection_area"] = building_services.apply(
-            lambda s: intersection(s.geometry, self[s.block_id][s.building_id].geometry), axis=1
+            lambda s: intersection(s.geometry, buildings_by_id[s.building_id].geometry), axis=1
         ).area
         building_services["service_id"] = building_services.index
         building_services = building_services.sort_values("intersection_area").drop_duplicates(
             subset="service_id", keep="last"
         )
         for building_info, services_gdf in building_services.groupby(["building_id", "block_id"]):
-            building_id, block_id = building_info
-            building = self[int(block_id)][int(building_id)]
-            building.update_services(service_type, services_gdf)
+            building_id, _ = building_info
+            buildings_by_id[building_id].update_services(service_type, services_gdf)
 
         # spatial join block and rest of services
         blocks_gdf = self.get_blocks_gdf()
         block_services = gdf.loc[~gdf.index.isin(building_services.index)]
         block_services = block_services.sjoin(blocks_gdf[["geometry"]])
         block_services = block_services.rename(columns={"index_right": "block_id"})
-        block_services.geometry = block_services.geometry.apply(
-            lambda g: g.buffer(0) if g.geom_type in ["Polygon", "MultiPolygon"] else g
-        )
+        polygon_mask = block_services.geom_type.isin(["Polygon", "MultiPolygon"])
+        block_services.loc[polygon_mask, "geometry"] = block_services.geometry[polygon_mask].buffer(0)
         block_services["intersection_area"] = block_services.apply(
-            lambda s: intersection(s.geometry, self[s.block_id].geometry), axis=1
+            lambda s: intersection(s.geometry, self._blocks[s.block_id].geometry), axis=1
         ).area
         block_services["service_id"] = block_services.index
         block_services = block_services.sort_values("intersection_area").drop_duplicates(
             subset="service_id", keep="last"
         )
         for block_id, gdf in block_services.groupby("block_id"):
-            block = self[int(block_id)]
-            block.update_services(service_type, gdf)
+            self._blocks[block_id].update_services(service_type, gdf)
 
     def add_service_type(self, service_type: ServiceType) -> None:
         """
@@ -22,4 +22,4 @@ class BaseSchema(pa.DataFrameModel):
     @pa.check("geometry")
     @classmethod
     def check_geometry(cls, series):
-        return series.map(lambda x: any([isinstance(x, geom_type) for geom_type in cls._geom_types]))
+        return series.geom_type.isin([geom_type.__name__ for geom_type in cls._geom_types])
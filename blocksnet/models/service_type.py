@@ -1,5 +1,6 @@
 import math
 
+import numpy as np
 from pydantic import BaseModel, Field, field_validator
 
 from .land_use import LandUse
@@ -123,6 +124,22 @@ class ServiceType(BaseModel):
         """
         return math.ceil(population / 1000 * self.demand)
 
+    def calculate_in_need_vector(self, population: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of `calculate_in_need` for a whole population array.
+
+        Parameters
+        ----------
+        population : np.ndarray
+            Array of populations.
+
+        Returns
+        -------
+        np.ndarray
+            Array of estimated numbers of people in need of this service type.
+        """
+        return np.ceil(population / 1000 * self.demand).astype(int)
+
     def __hash__(self) -> int:
         """
         Compute the hash value of the ServiceType object based on its name.
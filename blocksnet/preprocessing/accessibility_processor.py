@@ -41,18 +41,22 @@ class AccessibilityProcessor:
         blocks: gpd.GeoDataFrame,
     ):
         self.blocks = BlocksSchema(blocks)
+        self._polygon = None
 
     @property
     def polygon(self) -> Polygon:
         """
         Computes the convex hull polygon that encloses all blocks.
+        The result is cached, as the blocks are not supposed to change.
 
         Returns
         -------
         shapely.geometry.Polygon
             Convex hull of the blocks in the specified CRS (IDUEDU_CRS).
         """
-        return self.blocks.to_crs(IDUEDU_CRS).geometry.unary_union.convex_hull
+        if self._polygon is None:
+            self._polygon = self.blocks.to_crs(IDUEDU_CRS).geometry.unary_union.convex_hull
+        return self._polygon
 
     @staticmethod
     def plot(blocks: gpd.GeoDataFrame, graph: nx.Graph, figsize: tuple[int, int] = (10, 10), linewidth: float = 0.2):
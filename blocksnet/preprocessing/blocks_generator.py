@@ -122,9 +122,10 @@ class BlocksGenerator:
             assert gdf.crs == crs, "All CRS must match"
 
         logger.info("Exclude water objects")
-        line_water = water[water.geom_type != "LineString"].unary_union
+        polygon_water = water.geom_type != "LineString"
+        line_water = water[polygon_water].unary_union
         boundaries = boundaries.overlay(gpd.GeoDataFrame(geometry=[line_water], crs=water.crs), how="difference")
-        water["geometry"] = water["geometry"].apply(lambda x: x if x.geom_type == "LineString" else x.boundary)
+        water.loc[polygon_water, "geometry"] = water.geometry[polygon_water].boundary
 
         self.boundaries = boundaries
         self.roads = roads
@@ -164,7 +165,7 @@ class BlocksGenerator:
         barriers = gpd.GeoDataFrame(
             geometry=pd.concat([self.roads.geometry, self.water.geometry, self.railways.geometry]), crs=self.local_crs
         ).reset_index(drop=True)
-        barriers = barriers.explode(index_parts=True).reset_index(drop=True).geometry
+        barriers = barriers.explode(ignore_index=True).geometry
 
         # transform enclosed barriers to polygons
         logger.info("Setting up enclosures")
@@ -177,9 +178,7 @@ class BlocksGenerator:
         # cleanup after filling holes
         logger.info("Dropping overlapping blocks")
         blocks = utils.drop_contained_geometries(blocks)
-        blocks = blocks.explode(index_parts=False).reset_index(drop=True)
-
-        blocks = blocks.rename(columns={"index": "block_id"})
+        blocks = blocks.explode(ignore_index=True)
 
         # apply negative and positive buffers consecutively to remove small blocks
         # and divide them on bottlenecks
@@ -190,7 +189,7 @@ class BlocksGenerator:
 
         # calculate blocks' area in local projected CRS
         logger.info("Calculating blocks area")
-        blocks["area"] = blocks.to_crs(self.local_crs).area
+        blocks["area"] = blocks.area
         blocks = blocks[blocks["area"] > 1]
 
         # fix blocks' indices
@@ -198,7 +197,7 @@ class BlocksGenerator:
 
         logger.info("Blocks generated")
 
-        return BlocksSchema(blocks.to_crs(self.local_crs))
+        return BlocksSchema(blocks)
 
     @staticmethod
     def _get_enclosures(barriers: gpd.GeoDataFrame, limit: gpd.GeoDataFrame):
@@ -223,15 +222,14 @@ class BlocksGenerator:
         polygons = polygonize(unioned)
         enclosures = gpd.GeoSeries(list(polygons), crs=barriers.crs)
         _, enclosure_idxs = enclosures.representative_point().sindex.query(limit.geometry, predicate="contains")
-        enclosures = enclosures.iloc[np.unique(enclosure_idxs)]
-        enclosures = enclosures.rename("geometry").reset_index()
+        enclosures = enclosures.iloc[np.unique(enclosure_idxs)].reset_index(drop=True)
 
-        return enclosures
+        return gpd.GeoDataFrame(geometry=enclosures)
 
     @staticmethod
     def _reindex_blocks(blocks: gpd.GeoDataFrame):
         """
-        Reindexes the blocks, ensuring each block has a unique block_id.
+        Reindexes the blocks, ensuring each block has a unique index.
 
         Parameters
         ----------
@@ -243,6 +241,4 @@ class BlocksGenerator:
         gpd.GeoDataFrame
             GeoDataFrame with reindexed blocks.
         """
-        if "block_id" in blocks.columns:
-            blocks = blocks.drop("block_id", axis=1).reset_index().rename(columns={"index": "block_id"})
-        return blocks
+        return blocks.reset_index(drop=True)
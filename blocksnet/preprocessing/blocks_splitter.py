@@ -128,9 +128,7 @@ class BlocksSplitter:
         vd = voronoiDiagram4plg(buildings, block)
         vd = vd.explode(index_parts=True)
 
-        X = vd["geometry"].apply(lambda geom: geom.bounds).tolist()
-        X_flat = [coord for rect in X for coord in rect]
-        X = np.array(X_flat).reshape(-1, 4)
+        X = shapely.bounds(vd.geometry.values)
         scaler = StandardScaler()
         X_scaled = scaler.fit_transform(X)
 
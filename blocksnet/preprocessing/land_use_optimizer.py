@@ -111,6 +111,9 @@ class LandUseOptimizer:
         self.blocks = blocks
         self.adjacency_graph = self._get_adjacency_graph(blocks)
         self.verbose = verbose
+        # block geometries never change after init, so cache their derived metrics
+        self._block_areas = {b_id: geometry.area for b_id, geometry in blocks.geometry.items()}
+        self._block_aspect_ratios = {b_id: get_polygon_aspect_ratio(geometry) for b_id, geometry in blocks.geometry.items()}
 
     # @staticmethod
     # def _get_possible_lus(polygon) -> list[LandUse]:
@@ -205,7 +208,7 @@ class LandUseOptimizer:
         blocks_gdf.geometry = blocks_gdf.geometry.apply(
             lambda g: cls._split_polygon(g) if cls._is_block_large(g) else g
         )
-        return blocks_gdf.explode(index_parts=True).reset_index(drop=True)
+        return blocks_gdf.explode(ignore_index=True)
 
     @classmethod
     def _get_adjacency_graph(cls, blocks_gdf: gpd.GeoDataFrame, buffer: float = BUFFER_MIN):
@@ -227,7 +230,8 @@ class LandUseOptimizer:
         blocks_gdf = blocks_gdf.copy()
         blocks_gdf.geometry = blocks_gdf.buffer(buffer)
         sjoin = gpd.sjoin(blocks_gdf, blocks_gdf, predicate="intersects")
-        edge_list = [(i, s.index_right) for i, s in sjoin[sjoin.index != sjoin.index_right][["index_right"]].iterrows()]
+        neighbors = sjoin.loc[sjoin.index != sjoin["index_right"], "index_right"]
+        edge_list = list(zip(neighbors.index, neighbors))
         if len(edge_list) == 0:
             return cls._get_adjacency_graph(blocks_gdf, buffer + BUFFER_STEP)
         return nx.from_edgelist(edge_list)
@@ -301,7 +305,7 @@ class LandUseOptimizer:
         """
         for b_id, lu in X.items():
             area_min, area_max = AREA_RANGES[lu]
-            block_area = self.blocks.loc[b_id, "geometry"].area
+            block_area = self._block_areas[b_id]
             if block_area < area_min or block_area > area_max:
                 return False
         return True
@@ -321,7 +325,7 @@ class LandUseOptimizer:
             True if all aspect ratios are valid, False otherwise.
         """
         for b_id, lu in X.items():
-            ar = get_polygon_aspect_ratio(self.blocks.loc[b_id, "geometry"])
+            ar = self._block_aspect_ratios[b_id]
             min_ar, max_ar = ASPECT_RATIO_RANGES[lu]
             if ar < min_ar or ar > max_ar:
                 return False
@@ -341,9 +345,11 @@ class LandUseOptimizer:
         pd.DataFrame
             A dictionary mapping each land use to its share of the total area.
         """
-        gdf = self.to_gdf(X)
-        total_area = gdf.area.sum()
-        return {lu: gdf[gdf.land_use == lu.value].area.sum() / total_area for lu in list(LandUse)}
+        lu_areas = {lu: 0.0 for lu in list(LandUse)}
+        for b_id, lu in X.items():
+            lu_areas[lu] += self._block_areas[b_id]
+        total_area = sum(self._block_areas.values())
+        return {lu: area / total_area for lu, area in lu_areas.items()}
 
     def to_gdf(self, X: dict[int, LandUse]) -> gpd.GeoDataFrame:
         """
@@ -175,34 +175,36 @@ class LandUseProcessor:
             GeoDataFrame containing the processed blocks with land use classifications.
         """
 
-        zones = self.zones.copy()
-        # zones[LAND_USE_COLUMN] = zones[ZONE_COLUMN].replace(self.zone_to_land_use).apply(lambda x: x.name)
+        # zones are only read here, no need to copy them
+        zones = self.zones
 
         block_id_column = "block_id"
         blocks = self.blocks.copy()
         blocks[block_id_column] = blocks.index
 
-        # overlay geometries
+        # intersect geometries pairwise via the spatial index instead of an overlay
         logger.info("Overlaying geometries")
-        df_temp = gpd.overlay(
-            blocks[[block_id_column, "geometry"]],
-            zones[[ZONE_COLUMN, "geometry"]],
-            how="intersection",
-            keep_geom_type=False,
+        block_idxs, zone_idxs = zones.sindex.query(blocks.geometry, predicate="intersects")
+        intersections = shapely.intersection(
+            blocks.geometry.values[block_idxs], zones.geometry.values[zone_idxs]
+        )
+        df_temp = pd.DataFrame(
+            {
+                block_id_column: blocks.index.to_numpy()[block_idxs],
+                ZONE_COLUMN: zones[ZONE_COLUMN].to_numpy()[zone_idxs],
+                "intersection_area": shapely.area(intersections),
+            }
         )
 
         # get areas
-        df_temp["intersection_area"] = df_temp.area
         blocks["area"] = blocks.area
 
         # group by id and attribute value and find a sum of intersection areas
         logger.info("Finding sum of intersection areas")
         df_temp = df_temp.groupby([block_id_column, ZONE_COLUMN])["intersection_area"].sum().reset_index()
 
-        df_temp = df_temp.merge(blocks[[block_id_column, "area"]], how="left")
-
         # find intersection shares
-        df_temp["intersection_area"] = df_temp["intersection_area"] / df_temp["area"]
+        df_temp["intersection_area"] = df_temp["intersection_area"] / df_temp[block_id_column].map(blocks["area"])
 
         # filter out rows with attribute lower than min_intersection
         df_temp = df_temp[df_temp["intersection_area"] > min_intersection]
@@ -215,8 +217,7 @@ class LandUseProcessor:
         res.columns = [block_id_column] + [ZONE_COLUMN + "_" + str(i + 1) for i in range(len(res.columns) - 1)]
         res = blocks.drop("area", axis=1).merge(res, how="left")
         res = res.rename(columns={f"{ZONE_COLUMN}_1": ZONE_COLUMN})
-        res[LAND_USE_COLUMN] = (
-            res[ZONE_COLUMN].replace(self.zone_to_land_use).apply(lambda x: x.name if isinstance(x, LandUse) else None)
-        )
+        land_use_names = {zone: land_use.name for zone, land_use in self.zone_to_land_use.items()}
+        res[LAND_USE_COLUMN] = res[ZONE_COLUMN].map(land_use_names)
 
         return ProcessedBlocksSchema(res)
@@ -2,6 +2,7 @@
 Some helping functions used to perform certain spatial operations and can be used in different modules.
 """
 import geopandas as gpd
+import numpy as np
 from shapely.geometry import MultiPolygon, Polygon
 
 
@@ -23,7 +24,7 @@ def fill_holes(gdf):
     gdf["geometry"] = gdf["geometry"].boundary
     gdf = gdf.explode(index_parts=False)
     gdf["geometry"] = gdf["geometry"].map(lambda x: Polygon(x) if x.geom_type != "Point" else np.nan)
-    gdf = gdf.dropna(subset="geometry").reset_index(drop=True).to_crs(4326)
+    gdf = gdf.dropna(subset="geometry").reset_index(drop=True)
 
     return gdf
 
@@ -85,19 +86,21 @@ def filter_bottlenecks(gdf, projected_crs, min_width=40):
         except:
             return poly
 
-    gdf["geometry"] = (
-        gdf.to_crs(projected_crs)["geometry"]
-        .map(lambda x: _filter_bottlenecks_helper(x, min_width))
-        .set_crs(projected_crs)
-        .to_crs(4326)
-    )
+    # stay in the projected CRS for the whole processing and reproject
+    # back to the input CRS only if needed
+    crs = gdf.crs
+    if crs != projected_crs:
+        gdf = gdf.to_crs(projected_crs)
+    gdf["geometry"] = gdf["geometry"].map(lambda x: _filter_bottlenecks_helper(x, min_width))
     gdf = gdf[gdf["geometry"] != Polygon()]
     gdf = gdf.explode(index_parts=False)
     gdf = gdf[gdf.type == "Polygon"]
 
     if "area" in gdf.columns:
-        gdf["area"] = gdf.to_crs(projected_crs).area
+        gdf["area"] = gdf.area
 
+    if crs != projected_crs:
+        gdf = gdf.to_crs(crs)
     return gdf
 
 